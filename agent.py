@@ -1,6 +1,9 @@
 
 import asyncio
-from datetime import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Set, Tuple
 from uuid import uuid4
 
 from uagents import Agent, Context, Protocol
@@ -11,7 +14,24 @@ from uagents_core.contrib.protocols.chat import (
     chat_protocol_spec,
 )
 
-from job_search import run_job_search_sandbox, JobSearcher
+from job_search import (
+    SANDBOX_POOL_WARM,
+    SandboxPool,
+    run_job_search_sandbox,
+    get_searcher,
+    format_job_listing,
+    normalize_query,
+)
+
+# Prefer uvloop's libuv-based event loop where available (not on Windows,
+# which falls back to the default asyncio loop). Must be set before the
+# Agent is created, since it grabs its loop at construction.
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 agent = Agent(
     name="job-search-agent",
@@ -22,53 +42,170 @@ agent = Agent(
 
 protocol = Protocol(spec=chat_protocol_spec)
 
+# Fixed replies, built once and reused; only timestamp/msg_id vary per message
+HELP_CONTENT = TextContent(
+    type="text",
+    text="Please send a job search query, e.g., 'Remote data science internship in New York'.",
+)
+QUEUED_CONTENT = TextContent(
+    type="text",
+    text="All sandboxes are busy right now; your search is queued and will start shortly.",
+)
+
+# Bounds on blocking work. THREAD_POOL_SIZE sizes the loop's default executor,
+# which only serves run_in_executor(None, ...) callers: the shutdown cleanup
+# and third-party code such as uAgents. Searches are async and sandbox runs use
+# sandbox_executor below. SANDBOX_CONCURRENCY caps sandbox runs in flight.
+THREAD_POOL_SIZE = int(os.getenv('THREAD_POOL_SIZE', '32'))
+SANDBOX_CONCURRENCY = int(os.getenv('SANDBOX_CONCURRENCY', '4'))
+sandbox_semaphore = asyncio.Semaphore(SANDBOX_CONCURRENCY)
+
+# Sandbox provisioning is slow, so it gets its own threads rather than
+# queueing ahead of short blocking calls on the default executor. Sized so the
+# semaphore, not the executor, limits sandbox runs; the extra threads cover pool
+# refills (one at a time) and the short-lived refill submissions around them.
+sandbox_executor = ThreadPoolExecutor(
+    max_workers=SANDBOX_CONCURRENCY + 2, thread_name_prefix='sandbox'
+)
+
+sandbox_pool = SandboxPool(executor=sandbox_executor)
+
+
+def close_sandboxes() -> None:
+    """Stop sandbox work and delete pooled sandboxes (idempotent)
+
+    Must run before interpreter shutdown: since Python 3.9 executor threads
+    are joined before atexit callbacks, so only a prior stop keeps exit from
+    waiting on in-flight provisioning.
+    """
+    sandbox_executor.shutdown(wait=False, cancel_futures=True)
+    sandbox_pool.shutdown()
+
+# Searches in progress, keyed on normalized query, shared by identical requests,
+# along with everyone waiting on each one
+inflight_searches: Dict[str, asyncio.Task] = {}
+inflight_requesters: Dict[str, List[Tuple[Context, str]]] = {}
+# Keys of in-flight searches currently waiting for a sandbox slot
+queued_searches: Set[str] = set()
+
+
+@agent.on_event("startup")
+async def on_startup(ctx: Context):
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE))
+    # Warm-up is opt-in via SANDBOX_POOL_WARM; it runs in the background so the
+    # agent starts accepting messages immediately
+    if SANDBOX_POOL_WARM and sandbox_pool.size > 0:
+        ctx.logger.info(f"Warming {sandbox_pool.size} sandbox(es)")
+        loop.run_in_executor(sandbox_executor, sandbox_pool.warm)
+
+
+async def notify_queued(ctx: Context, sender: str):
+    await ctx.send(
+        sender,
+        ChatMessage(
+            timestamp=datetime.now(timezone.utc),
+            msg_id=uuid4(),
+            content=[QUEUED_CONTENT],
+        ),
+    )
+
+
+async def run_sandbox_limited(key: str, query: str, formatted_jobs):
+    """Run the sandbox flow, queueing behind SANDBOX_CONCURRENCY in-flight runs"""
+    try:
+        if sandbox_semaphore.locked():
+            # Requesters joining later see the key and notify themselves
+            queued_searches.add(key)
+            await asyncio.gather(
+                *(notify_queued(ctx, sender) for ctx, sender in inflight_requesters.get(key, [])),
+                return_exceptions=True,
+            )
+        async with sandbox_semaphore:
+            queued_searches.discard(key)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                sandbox_executor, run_job_search_sandbox, query, sandbox_pool, formatted_jobs
+            )
+    finally:
+        queued_searches.discard(key)
+
+
+async def search_and_preview(key: str, query: str):
+    """Search jobs, then publish them to a sandbox; returns (sandbox_result, formatted_jobs)"""
+    jobs = await get_searcher().search_jobs_async(query, 1)
+    # Formatted once, shared by the sandbox page and the chat reply
+    formatted_jobs = [format_job_listing(job) for job in jobs[:10]]
+    if not formatted_jobs:
+        return (None, None), formatted_jobs
+    sandbox_result = await run_sandbox_limited(key, query, formatted_jobs)
+    return sandbox_result, formatted_jobs
+
+
+async def search_and_preview_shared(ctx: Context, sender: str, query: str):
+    """Like search_and_preview, but concurrent identical queries await a single run
+
+    Every requester is recorded so each one hears if the run has to queue.
+    """
+    key = normalize_query(query)
+    task = inflight_searches.get(key)
+    if task is None:
+        inflight_requesters[key] = []
+        task = asyncio.create_task(search_and_preview(key, query))
+        inflight_searches[key] = task
+
+        def forget(_):
+            inflight_searches.pop(key, None)
+            inflight_requesters.pop(key, None)
+
+        task.add_done_callback(forget)
+    inflight_requesters.setdefault(key, []).append((ctx, sender))
+    if key in queued_searches:
+        await notify_queued(ctx, sender)
+    # Shield so one requester going away doesn't cancel the run for the others
+    return await asyncio.shield(task)
+
+
+def extract_text(content) -> str:
+    """Extract plain text from chat content"""
+    # Most messages carry a single text part; skip the join for those
+    if len(content) == 1:
+        part = content[0]
+        return part.text if isinstance(part, TextContent) else ""
+    return "".join(part.text for part in content if isinstance(part, TextContent))
+
 
 @protocol.on_message(ChatMessage)
 async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
+    now = datetime.now(timezone.utc)
     await ctx.send(
         sender,
-        ChatAcknowledgement(timestamp=datetime.utcnow(), acknowledged_msg_id=msg.msg_id),
+        ChatAcknowledgement(timestamp=now, acknowledged_msg_id=msg.msg_id),
     )
 
-    # Extract plain text from chat content
-    text = ""
-    for part in msg.content:
-        if isinstance(part, TextContent):
-            text += part.text
-    query = (text or "").strip()
+    query = extract_text(msg.content).strip()
 
     if not query or len(query) < 3:
         await ctx.send(
             sender,
             ChatMessage(
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 msg_id=uuid4(),
-                content=[
-                    TextContent(
-                        type="text",
-                        text="Please send a job search query, e.g., 'Remote data science internship in New York'.",
-                    )
-                ],
+                content=[HELP_CONTENT],
             ),
         )
         return
 
-    loop = asyncio.get_running_loop()
     try:
-        sandbox_task = loop.run_in_executor(None, run_job_search_sandbox, query)
-        jobs_task = loop.run_in_executor(None, JobSearcher().search_jobs, query, 1)
-        (sandbox_result, jobs) = await asyncio.gather(sandbox_task, jobs_task)
+        (sandbox_result, formatted_jobs) = await search_and_preview_shared(ctx, sender, query)
 
         _, url = sandbox_result if isinstance(sandbox_result, tuple) else (None, None)
 
         jobs_preview_lines = []
-        if jobs:
-            searcher = JobSearcher()
-            for i, job in enumerate(jobs[:5], 1):
-                j = searcher.format_job_listing(job)
-                jobs_preview_lines.append(
-                    f"{i}. {j['title']} — {j['company']} — {j['location']} ({j['employment_type']})\nApply: {j['apply_link']}"
-                )
+        for i, j in enumerate(formatted_jobs[:5], 1):
+            jobs_preview_lines.append(
+                f"{i}. {j['title']} — {j['company']} — {j['location']} ({j['employment_type']})\nApply: {j['apply_link']}"
+            )
         jobs_preview = "\n\n".join(jobs_preview_lines) if jobs_preview_lines else "No jobs found."
 
         url_part = f"Preview URL: {url}" if url else "Preview URL unavailable."
@@ -79,13 +216,18 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
     await ctx.send(
         sender,
         ChatMessage(
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.now(timezone.utc),
             msg_id=uuid4(),
             content=[TextContent(type="text", text=reply)],
         ),
     )
 
 
+@agent.on_event("shutdown")
+async def on_shutdown(ctx: Context):
+    await asyncio.get_running_loop().run_in_executor(None, close_sandboxes)
+
+
 @protocol.on_message(ChatAcknowledgement)
 async def handle_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
     ctx.logger.info(f"Acknowledged message {msg.acknowledged_msg_id} from {sender}")
@@ -95,6 +237,10 @@ agent.include(protocol, publish_manifest=True)
 
 
 if __name__ == "__main__":
-    agent.run()
+    try:
+        agent.run()
+    finally:
+        # Also covers exits where the agent's shutdown handlers don't run
+        close_sandboxes()
 
 
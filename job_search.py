@@ -4,83 +4,146 @@ Job Search with Daytona Sandbox
 Combines job search functionality with Daytona sandbox execution and Flask web preview
 """
 
-import requests
+import httpx
 import json
 import os
-from typing import Dict, List, Any
+import queue
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Any, NamedTuple, Optional
 import time
-from daytona import Daytona, DaytonaConfig, SessionExecuteRequest
+import threading
+from concurrent.futures import ALL_COMPLETED, Executor, ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+from uuid import uuid4
+from functools import lru_cache
+from cachetools import TTLCache
+
+# The Daytona SDK and requests are only needed once a sandbox is used, so
+# they are imported lazily to keep agent start-up fast and light
+if TYPE_CHECKING:
+    from daytona import Daytona
+    import requests
 
 from dotenv import load_dotenv
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    def _loads(data: bytes) -> Any:
+        """Decode JSON with the stdlib when orjson is not installed"""
+        return json.loads(data)
+
+    def _dumps(obj: Any) -> bytes:
+        """Encode compact JSON with the stdlib when orjson is not installed"""
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 load_dotenv()
 
+# API credentials, captured once at import time
+JSEARCH_API_KEY = os.getenv('JSEARCH_API_KEY', '')
+JSEARCH_HOST = "jsearch.p.rapidapi.com"
+DAYTONA_API_KEY = os.getenv('DAYTONA_API_KEY')
+
+# Async client for the agent's event loop; HTTP/2 multiplexes concurrent searches
+_HTTPX = httpx.AsyncClient(
+    http2=True,
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
+
+# Recent search results, keyed on (normalized query, num_pages)
+_SEARCH_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _safe_link(url: Optional[str]) -> str:
+    """Keep only http(s) links, so API data can't inject javascript: and similar URLs"""
+    if url and urlsplit(url.strip()).scheme.lower() in ('http', 'https'):
+        return url
+    return '#'
+
+
+def normalize_query(text: str) -> str:
+    """Lowercase and collapse whitespace so equivalent queries share a cache key"""
+    return ' '.join(text.split()).lower()
+
+
+# Query keyword patterns, compiled once. Named groups are listed in priority
+# order and double as the values returned by the extractors.
+_JOB_TYPE_STOPWORDS = frozenset(['internship', 'job', 'position', 'role', 'remote', 'onsite', 'hybrid'])
+_LOCATIONS = ['new york', 'san francisco', 'chicago', 'los angeles', 'seattle',
+              'boston', 'austin', 'denver', 'miami', 'remote', 'anywhere', 'us', 'uk']
+_LOCATION_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _LOCATIONS)) + r')\b', re.I)
+_EMPLOYMENT_TYPE_RE = re.compile(
+    r'(?P<INTERNSHIP>internship)|(?P<PART_TIME>\bpart[ .-]time\b)|(?P<CONTRACTOR>contract)', re.I
+)
+_EXPERIENCE_LEVEL_RE = re.compile(
+    r'(?P<entry_level>intern|junior|entry)|(?P<senior>senior|lead|staff)', re.I
+)
+
+
+def _first_group(pattern: re.Pattern, text: str, default: str) -> str:
+    """Return the highest-priority named group matched anywhere in text"""
+    found = {m.lastgroup for m in pattern.finditer(text)}
+    for name in pattern.groupindex:
+        if name in found:
+            return name
+    return default
+
+
 class JobSearcher:
     """Main class for job searching with AI enhancement"""
     
     def __init__(self):
         """Initialize API credentials from environment variables"""
-        self.jsearch_api_key = os.getenv('JSEARCH_API_KEY', '')
-        self.jsearch_host = "jsearch.p.rapidapi.com"
+        self.jsearch_api_key = JSEARCH_API_KEY
+        self.jsearch_host = JSEARCH_HOST
         # ASI integration removed (unused)
     
     def parse_job_query(self, user_prompt: str) -> Dict[str, str]:
         """Parse user prompt to extract job search parameters"""
-        query_parts = {
-            'job_type': self._extract_job_type(user_prompt),
-            'location': self._extract_location(user_prompt),
-            'employment_type': self._extract_employment_type(user_prompt),
-            'experience_level': self._extract_experience_level(user_prompt),
-        }
-        return query_parts
+        return _parse_job_query_cached(normalize_query(user_prompt))
     
-    def _extract_job_type(self, text: str) -> str:
+    @staticmethod
+    def _extract_job_type(text: str) -> str:
         """Extract job title/type from prompt"""
-        keywords = ['internship', 'job', 'position', 'role', 'remote', 'onsite', 'hybrid']
         words = text.split()
-        job_words = [w for w in words if w.lower() not in keywords and len(w) > 2]
+        job_words = [w for w in words if w.lower() not in _JOB_TYPE_STOPWORDS and len(w) > 2]
         return ' '.join(job_words[:3]) if job_words else text
     
-    def _extract_location(self, text: str) -> str:
+    @staticmethod
+    def _extract_location(text: str) -> str:
         """Extract location from prompt"""
-        locations = ['new york', 'san francisco', 'chicago', 'los angeles', 'seattle', 
-                    'boston', 'austin', 'denver', 'miami', 'remote', 'anywhere', 'us', 'uk']
-        text_lower = text.lower()
-        for loc in locations:
-            if loc in text_lower:
-                return loc.replace(' ', '_').upper()
-        return 'US'
+        found = {m.group(1).lower() for m in _LOCATION_RE.finditer(text)}
+        if not found:
+            return 'US'
+        # Earlier entries in _LOCATIONS take precedence, regardless of position in text
+        loc = min(found, key=_LOCATIONS.index)
+        return loc.replace(' ', '_').upper()
     
-    def _extract_employment_type(self, text: str) -> str:
+    @staticmethod
+    def _extract_employment_type(text: str) -> str:
         """Extract employment type"""
-        text_lower = text.lower()
-        if 'internship' in text_lower:
-            return 'INTERNSHIP'
-        elif 'part.time' in text_lower or 'part-time' in text_lower:
-            return 'PART_TIME'
-        elif 'contract' in text_lower or 'contractor' in text_lower:
-            return 'CONTRACTOR'
-        else:
-            return 'FULLTIME'
+        return _first_group(_EMPLOYMENT_TYPE_RE, text, 'FULLTIME')
     
-    def _extract_experience_level(self, text: str) -> str:
+    @staticmethod
+    def _extract_experience_level(text: str) -> str:
         """Extract experience level"""
-        text_lower = text.lower()
-        if 'intern' in text_lower or 'junior' in text_lower or 'entry' in text_lower:
-            return 'entry_level'
-        elif 'senior' in text_lower or 'lead' in text_lower or 'staff' in text_lower:
-            return 'senior'
-        else:
-            return 'mid_level'
+        return _first_group(_EXPERIENCE_LEVEL_RE, text, 'mid_level')
     
-    def search_jobs(self, user_prompt: str, num_pages: int = 1) -> List[Dict[str, Any]]:
-        """Search for jobs based on user prompt"""
+    def _search_request(self, user_prompt: str, num_pages: int):
+        """Build the jsearch URL, headers and query string for a prompt"""
         params = self.parse_job_query(user_prompt)
         query = f"{params['job_type']} jobs in {params['location']}"
         
         headers = {
             "x-rapidapi-key": self.jsearch_api_key,
-            "x-rapidapi-host": self.jsearch_host
+            "x-rapidapi-host": self.jsearch_host,
+            "Connection": "keep-alive",
         }
         
         querystring = {
@@ -90,18 +153,42 @@ class JobSearcher:
             "country": "us",
             "date_posted": "all"
         }
-        
+        return f"https://{self.jsearch_host}/search", headers, querystring
+    
+    @staticmethod
+    def _get_cached_jobs(cache_key):
+        """Return cached jobs for a key, or None on a miss"""
+        with _SEARCH_CACHE_LOCK:
+            return _SEARCH_CACHE.get(cache_key)
+    
+    @staticmethod
+    def _cache_jobs(cache_key, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract jobs from an API payload, caching non-empty results"""
+        jobs = data.get('data', [])
+        # Only cache non-empty results so transient failures are retried
+        if jobs:
+            with _SEARCH_CACHE_LOCK:
+                _SEARCH_CACHE[cache_key] = jobs
+        return jobs
+    
+    def search_jobs(self, user_prompt: str, num_pages: int = 1) -> List[Dict[str, Any]]:
+        """Search for jobs based on user prompt"""
+        cache_key = (normalize_query(user_prompt), num_pages)
+        cached = self._get_cached_jobs(cache_key)
+        if cached is not None:
+            return cached
+
+        url, headers, querystring = self._search_request(user_prompt, num_pages)
         try:
-            response = requests.get(
-                f"https://{self.jsearch_host}/search",
+            response = get_session().get(
+                url,
                 headers=headers,
-                params=querystring
+                params=querystring,
+                timeout=(3, 10)
             )
             
             if response.status_code == 200:
-                data = response.json()
-                jobs = data.get('data', [])
-                return jobs
+                return self._cache_jobs(cache_key, _loads(response.content))
             else:
                 print(f"API Error: {response.status_code}")
                 return []
@@ -109,266 +196,453 @@ class JobSearcher:
             print(f"Error searching jobs: {str(e)}")
             return []
     
-    def format_job_listing(self, job: Dict[str, Any]) -> Dict[str, str]:
+    async def search_jobs_async(self, user_prompt: str, num_pages: int = 1) -> List[Dict[str, Any]]:
+        """Search for jobs on the running event loop via the shared httpx client"""
+        cache_key = (normalize_query(user_prompt), num_pages)
+        cached = self._get_cached_jobs(cache_key)
+        if cached is not None:
+            return cached
+
+        url, headers, querystring = self._search_request(user_prompt, num_pages)
+        try:
+            response = await _HTTPX.get(url, headers=headers, params=querystring)
+            
+            if response.status_code == 200:
+                return self._cache_jobs(cache_key, _loads(response.content))
+            else:
+                print(f"API Error: {response.status_code}")
+                return []
+        except Exception as e:
+            print(f"Error searching jobs: {str(e)}")
+            return []
+    
+    @staticmethod
+    def format_job_listing(job: Dict[str, Any]) -> Dict[str, str]:
         """Format a single job listing for web display"""
+        get = job.get
+        desc = get('job_description') or ''
         return {
-            'title': job.get('job_title', 'N/A'),
-            'company': job.get('employer_name', 'N/A'),
-            'location': job.get('job_location', 'N/A'),
-            'employment_type': job.get('job_employment_type', 'N/A'),
-            'apply_link': job.get('job_apply_link', '#'),
-            'website': job.get('employer_website') or job.get('employer_url') or '',
-            'description': job.get('job_description', '')[:200] + '...' if job.get('job_description') else 'No description',
+            'title': get('job_title') or 'N/A',
+            'company': get('employer_name') or 'N/A',
+            'location': get('job_location') or 'N/A',
+            'employment_type': get('job_employment_type') or 'N/A',
+            'apply_link': _safe_link(get('job_apply_link')),
+            'website': get('employer_website') or get('employer_url') or '',
+            'description': desc[:200] + '...' if desc else 'No description',
         }
 
 
-def create_flask_app(jobs: List[Dict[str, Any]]) -> str:
-    """Create Flask web app code with job results"""
-    searcher = JobSearcher()
-    formatted_jobs = [searcher.format_job_listing(job) for job in jobs[:10]]
-    jobs_html = ""
-    
-    for i, job in enumerate(formatted_jobs, 1):
-        jobs_html += f"""
-        <div class="job-card">
-            <h3>{i}. {job['title']}</h3>
-            <p><strong>Company:</strong> {job['company']}</p>
-            <p><strong>Location:</strong> {job['location']}</p>
-            <p><strong>Type:</strong> {job['employment_type']}</p>
-            <p><strong>Description:</strong> {job['description']}</p>
-            <a href="{job['apply_link']}" target="_blank" class="btn">Apply Now</a>
-        </div>
-        """
-    
-    flask_code = f'''
-from flask import Flask
-import os
+@lru_cache(maxsize=1)
+def get_session() -> "requests.Session":
+    """Return the shared HTTP session, so sync jsearch calls and readiness
+    probes reuse pooled keep-alive connections"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 
-app = Flask(__name__)
-
-@app.route('/callback')
-def callback():
-    return "ok", 200
-
-@app.route('/healthz')
-def healthz():
-    return "ok", 200
-
-@app.route('/')
-def jobs():
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Job Search Results</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                max-width: 1000px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }}
-            h1 {{
-                text-align: center;
-                color: #333;
-            }}
-            .job-card {{
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 15px 0;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .job-card h3 {{
-                margin-top: 0;
-                color: #2c3e50;
-            }}
-            .job-card p {{
-                margin: 10px 0;
-                color: #555;
-            }}
-            .job-card strong {{
-                color: #333;
-            }}
-            .btn {{
-                display: inline-block;
-                padding: 10px 20px;
-                background-color: #007bff;
-                color: white;
-                text-decoration: none;
-                border-radius: 4px;
-                margin-top: 10px;
-                transition: background-color 0.3s;
-            }}
-            .btn:hover {{
-                background-color: #0056b3;
-            }}
-        </style>
-    </head>
-    <body>
-        <h1>🔍 Job Search Results</h1>
-        {jobs_html}
-    </body>
-    </html>
-    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2),
+    ))
+    return session
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', '3000'))
-    app.run(host='0.0.0.0', port=port)
-'''
-    return flask_code
 
+@lru_cache(maxsize=1)
+def get_probe_session() -> "requests.Session":
+    """Return a retry-free session for readiness probes; the caller's backoff
+    loop does the retrying, so urllib3 retries would only stretch each probe"""
+    import requests
+    from requests.adapters import HTTPAdapter
 
-def run_job_search_sandbox(user_prompt: str):
-    """Run job search in Daytona sandbox with web preview"""
-    
-    # Initialize Daytona
-    daytona_api_key = os.getenv('DAYTONA_API_KEY')
-    if not daytona_api_key:
-        print("Error: DAYTONA_API_KEY environment variable not set")
-        return
-    
-    daytona = Daytona(DaytonaConfig(api_key=daytona_api_key))
-    
-    # Create sandbox
-    print("Creating Daytona sandbox...")
-    sandbox = daytona.create()
-    
-    # Search for jobs
-    print(f"Searching jobs for: {user_prompt}")
-    searcher = JobSearcher()
-    jobs = searcher.search_jobs(user_prompt, num_pages=1)
-    
-    if jobs:
-        print(f"Found {len(jobs)} jobs!")
-        
-        # Create Flask app with results
-        flask_code = create_flask_app(jobs)
-        
-        # Upload Flask app to sandbox
-        print("Uploading Flask app to sandbox...")
-        sandbox.fs.upload_file(flask_code.encode(), "app.py")
-        
-        # Create session and run Flask app
-        print("Starting Flask app in sandbox...")
-        exec_session_id = "job-search-session"
-        sandbox.process.create_session(exec_session_id)
-        
-        # Ensure Flask is available in the sandbox using the interpreter that will execute the app
-        install_cmds = [
-            "python3 -m pip install --no-cache-dir flask",
-            "python -m pip install --no-cache-dir flask",
-            "pip3 install --no-cache-dir flask",
-            "pip install --no-cache-dir flask",
-        ]
-        for cmd in install_cmds:
-            try:
-                resp = sandbox.process.execute_session_command(
-                    exec_session_id,
-                    SessionExecuteRequest(
-                        command=cmd,
-                        run_async=False
-                    )
-                )
-                # Best-effort; stop trying if one succeeds
-                break
-            except Exception:
-                continue
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=0))
+    return session
 
-        # Verify the uploaded app exists and is readable
+
+@lru_cache(maxsize=512)
+def _parse_job_query_cached(query: str) -> Dict[str, str]:
+    """Parse a normalized query; results are shared, treat as read-only"""
+    return {
+        'job_type': JobSearcher._extract_job_type(query),
+        'location': JobSearcher._extract_location(query),
+        'employment_type': JobSearcher._extract_employment_type(query),
+        'experience_level': JobSearcher._extract_experience_level(query),
+    }
+
+
+@lru_cache(maxsize=1)
+def get_searcher() -> JobSearcher:
+    """Return the shared JobSearcher instance"""
+    return JobSearcher()
+
+
+format_job_listing = JobSearcher.format_job_listing
+
+
+# Source of the results app run inside each sandbox (uploaded as app.py)
+SANDBOX_APP_CODE = (Path(__file__).parent / "sandbox_app.py").read_bytes()
+SANDBOX_SESSION_ID = "job-search-session"
+# Optional Daytona snapshot with Flask preinstalled, skipping pip on new sandboxes
+SANDBOX_SNAPSHOT = os.getenv('SANDBOX_SNAPSHOT')
+
+# Warm pool sizing; sandboxes older than the TTL are replaced on checkout
+SANDBOX_POOL_SIZE = int(os.getenv('SANDBOX_POOL_SIZE', '2'))
+# Whether the agent fills the pool at start-up. Off by default, since that loads
+# the Daytona SDK before any request; otherwise the pool fills from released sandboxes
+SANDBOX_POOL_WARM = os.getenv('SANDBOX_POOL_WARM', '').lower() in ('1', 'true', 'yes')
+SANDBOX_POOL_TTL = float(os.getenv('SANDBOX_POOL_TTL', '900'))
+# How long a /results/<id> URL stays valid after it was issued
+SANDBOX_RESULTS_TTL = float(os.getenv('SANDBOX_RESULTS_TTL', '3600'))
+
+
+# Threads for issuing independent Daytona control-plane calls concurrently
+_RPC_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='daytona-rpc')
+
+
+@lru_cache(maxsize=1)
+def get_daytona() -> "Daytona":
+    """Return the shared Daytona client"""
+    from daytona import Daytona, DaytonaConfig
+
+    return Daytona(DaytonaConfig(api_key=DAYTONA_API_KEY))
+
+
+def _wait_until_ready(
+    url: str, timeout: float = 45, stop: Optional[threading.Event] = None
+) -> bool:
+    """Poll the app's /callback endpoint until it answers, the timeout expires,
+    or `stop` is set"""
+    health_url = url.rstrip('/') + '/callback'
+    # Exponential backoff from 100ms up to 1.5s, bounded to ~timeout overall
+    delay = 0.1
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not (stop is not None and stop.is_set()):
         try:
-            sandbox.process.execute_session_command(
-                exec_session_id,
-                SessionExecuteRequest(
-                    command="ls -l app.py || true",
-                    run_async=False
-                )
-            )
+            r = get_probe_session().get(health_url, timeout=(0.5, 1.5))
+            if r.status_code == 200:
+                return True
         except Exception:
             pass
+        time.sleep(delay)
+        delay = min(delay * 1.5, 1.5)
+    return False
+
+
+def start_results_app(daytona: "Daytona", stop: Optional[threading.Event] = None):
+    """Create a sandbox running the results app; returns (sandbox, url, ready)
+
+    Setting `stop` aborts setup between steps; the sandbox is then deleted.
+    """
+    from daytona import CreateSandboxFromSnapshotParams
 
-        # Print interpreter details for debugging
+    print("Creating Daytona sandbox...")
+    if SANDBOX_SNAPSHOT:
+        sandbox = daytona.create(CreateSandboxFromSnapshotParams(snapshot=SANDBOX_SNAPSHOT))
+    else:
+        sandbox = daytona.create()
+
+    try:
+        url, ready = _setup_results_app(sandbox, stop)
+    except BaseException:
+        # Nothing else holds a reference to the sandbox yet, so delete it here
+        # rather than leaving it running (and billed) after a failed setup
         try:
-            sandbox.process.execute_session_command(
-                exec_session_id,
-                SessionExecuteRequest(
-                    command="python3 -V || true; which python3 || true; python -V || true; which python || true",
-                    run_async=False
-                )
-            )
+            sandbox.delete()
         except Exception:
             pass
+        raise
+    return sandbox, url, ready
+
+
+def _check_stop(stop: Optional[threading.Event]) -> None:
+    if stop is not None and stop.is_set():
+        raise RuntimeError("Sandbox setup aborted: shutting down")
+
+
+def _setup_results_app(sandbox, stop: Optional[threading.Event] = None):
+    """Upload and start the results app in a new sandbox; returns (url, ready)"""
+    from daytona import SessionExecuteRequest
+
+    _check_stop(stop)
+
+    # These calls only need the sandbox to exist, so issue them concurrently:
+    # upload the results app, create the exec session, and fetch preview links
+    print("Uploading Flask app to sandbox...")
+    upload = _RPC_EXECUTOR.submit(sandbox.fs.upload_file, SANDBOX_APP_CODE, "app.py")
+    session = _RPC_EXECUTOR.submit(sandbox.process.create_session, SANDBOX_SESSION_ID)
+    preview = _RPC_EXECUTOR.submit(sandbox.get_preview_link, 3000)
+    terminal = _RPC_EXECUTOR.submit(sandbox.get_preview_link, 22222)
+    wait([upload, session, preview, terminal], return_when=ALL_COMPLETED)
+    upload.result()
+    session.result()
+    _check_stop(stop)
+
+    print("Starting Flask app in sandbox...")
 
-        # Start Flask app inside the session (keeps running via session)
+    # Ensure Flask is available (skipped if the image already has it), then verify
+    # the upload and print interpreter details, all in a single round-trip
+    setup_cmd = (
+        "python3 -c 'import flask' 2>/dev/null"
+        " || python3 -m pip install --no-cache-dir flask"
+        " || python -m pip install --no-cache-dir flask"
+        " || pip3 install --no-cache-dir flask"
+        " || pip install --no-cache-dir flask"
+        "; ls -l app.py || true"
+        "; python3 -V || true; which python3 || true; python -V || true; which python || true"
+    )
+    try:
         sandbox.process.execute_session_command(
-            exec_session_id,
+            SANDBOX_SESSION_ID,
             SessionExecuteRequest(
-                command="python3 app.py || python app.py",
-                run_async=True
+                command=setup_cmd,
+                run_async=False
             )
         )
-        
-        # Get preview link
-        preview_info = sandbox.get_preview_link(3000)
-        terminal_info = None
+    except Exception:
+        pass
+
+    _check_stop(stop)
+
+    # Start Flask app inside the session (keeps running via session)
+    sandbox.process.execute_session_command(
+        SANDBOX_SESSION_ID,
+        SessionExecuteRequest(
+            command="python3 app.py || python app.py",
+            run_async=True
+        )
+    )
+
+    preview_info = preview.result()
+    terminal_info = None
+    try:
+        terminal_info = terminal.result()
+    except Exception:
+        pass
+
+    # Wait until the app is reachable
+    url = preview_info.url
+    ready = _wait_until_ready(url, stop=stop)
+    _check_stop(stop)
+
+    # If not ready, try to show recent logs and running processes for debugging
+    if not ready:
         try:
-            terminal_info = sandbox.get_preview_link(22222)
+            sandbox.process.execute_session_command(
+                SANDBOX_SESSION_ID,
+                SessionExecuteRequest(
+                    command=(
+                        "ps aux | grep -E 'python(3)? /app.py' | grep -v grep"
+                        "; tail -n 200 /app.log || true"
+                    ),
+                    run_async=False
+                )
+            )
         except Exception:
             pass
 
-        # Wait until the app is reachable
-        url = preview_info.url
-        health_url = url.rstrip('/') + '/callback'
-        ready = False
-        for _ in range(45):  # ~45s
-            try:
-                r = requests.get(health_url, timeout=2)
-                if r.status_code == 200:
-                    ready = True
-                    break
-            except Exception:
-                pass
-            time.sleep(1)
-
-        # If not ready, try to show recent logs and running processes for debugging
-        if not ready:
+    if terminal_info:
+        print(f"Terminal URL: {terminal_info.url}")
+    print(f"Sandbox ID: {sandbox.id}")
+    return url, ready
+
+
+class PooledSandbox(NamedTuple):
+    """A sandbox running the results app, as tracked by SandboxPool"""
+    sandbox: Any
+    url: str
+    created_at: float
+    last_used: float
+    ready: bool
+
+
+class SandboxPool:
+    """Keeps sandboxes with the results app already running, ready for checkout
+
+    At most `size` sandboxes are kept idle. Sandboxes that expire (after `ttl`)
+    or exceed `size` are retired: no longer handed out, and deleted only once
+    the results URLs they issued are `results_ttl` seconds old. With an
+    `executor`, the pool is topped back up in the background after a removal.
+    """
+
+    def __init__(
+        self,
+        size: int = SANDBOX_POOL_SIZE,
+        ttl: float = SANDBOX_POOL_TTL,
+        results_ttl: float = SANDBOX_RESULTS_TTL,
+        executor: Optional[Executor] = None,
+    ):
+        self.size = size
+        self.ttl = ttl
+        self.results_ttl = results_ttl
+        self.executor = executor
+        self._idle: queue.Queue = queue.Queue()
+        # Retired sandboxes as (delete_at, sandbox)
+        self._retired: List = []
+        self._lock = threading.Lock()
+        self._warming = False
+        # Set by shutdown(); aborts in-flight provisioning between setup steps
+        self._closed = threading.Event()
+
+    def _provision(self) -> PooledSandbox:
+        if self._closed.is_set():
+            raise RuntimeError("Sandbox pool is shut down")
+        sandbox, url, ready = start_results_app(get_daytona(), stop=self._closed)
+        now = time.monotonic()
+        return PooledSandbox(sandbox, url, now, now, ready)
+
+    def warm(self) -> None:
+        """Provision sandboxes until `size` are idle"""
+        if not DAYTONA_API_KEY or self.size <= 0:
+            return
+        with self._lock:
+            if self._warming:
+                return
+            self._warming = True
+        try:
+            while self._idle.qsize() < self.size and not self._closed.is_set():
+                try:
+                    self.release(self._provision())
+                except Exception as e:
+                    print(f"Error warming sandbox pool: {str(e)}")
+                    return
+        finally:
+            with self._lock:
+                self._warming = False
+
+    def _refill(self) -> None:
+        if self.executor is not None and self.size > 0:
+            self.executor.submit(self.warm)
+
+    def acquire(self) -> PooledSandbox:
+        """Check out a healthy warm sandbox, provisioning one if none are idle"""
+        self._reap()
+        while True:
             try:
-                sandbox.process.execute_session_command(
-                    exec_session_id,
-                    SessionExecuteRequest(
-                        command="ps aux | grep -E 'python(3)? /app.py' | grep -v grep",
-                        run_async=False
-                    )
-                )
-            except Exception:
-                pass
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                return self._provision()
+            if time.monotonic() - entry.created_at >= self.ttl:
+                self._retire(entry)
+            elif _wait_until_ready(entry.url, timeout=2):
+                return entry._replace(ready=True)
+            else:
+                self.discard(entry)
+            self._refill()
+
+    def release(self, entry: PooledSandbox) -> None:
+        """Return a sandbox to the pool once its results have been uploaded"""
+        if self._closed.is_set():
+            self.discard(entry)
+            return
+        entry = entry._replace(last_used=time.monotonic())
+        with self._lock:
+            keep = self._idle.qsize() < self.size
+            if keep:
+                self._idle.put(entry)
+        if not keep:
+            self._retire(entry)
+        self._reap()
+
+    def discard(self, entry: PooledSandbox) -> None:
+        """Delete a checked-out sandbox instead of returning it"""
+        self._delete(entry.sandbox)
+
+    def shutdown(self) -> None:
+        """Stop provisioning and delete every idle and retired sandbox
+
+        In-flight provisioning stops at its next setup step and deletes its
+        sandbox; sandboxes checked out at this point are deleted on release.
+        """
+        self._closed.set()
+        while True:
             try:
-                sandbox.process.execute_session_command(
-                    exec_session_id,
-                    SessionExecuteRequest(
-                        command="tail -n 200 /app.log || true",
-                        run_async=False
-                    )
-                )
-            except Exception:
-                pass
-
-        print(f"\n✅ Job search app is running!")
-        print(f"Preview URL: {url}")
-        if terminal_info:
-            print(f"Terminal URL: {terminal_info.url}")
-        print(f"Sandbox ID: {sandbox.id}")
-        if not ready:
-            print("Note: App is starting up; if you see 502, wait a few seconds and refresh.")
-        
-        return sandbox, url
-    else:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._delete(entry.sandbox)
+        with self._lock:
+            retired, self._retired = self._retired, []
+        for _, sandbox in retired:
+            self._delete(sandbox)
+
+    def _retire(self, entry: PooledSandbox) -> None:
+        with self._lock:
+            self._retired.append((entry.last_used + self.results_ttl, entry.sandbox))
+
+    def _reap(self) -> None:
+        """Delete retired sandboxes whose results URLs have all expired"""
+        now = time.monotonic()
+        with self._lock:
+            due = [sandbox for delete_at, sandbox in self._retired if delete_at <= now]
+            self._retired = [item for item in self._retired if item[0] > now]
+        for sandbox in due:
+            self._delete(sandbox)
+
+    @staticmethod
+    def _delete(sandbox) -> None:
+        try:
+            sandbox.delete()
+        except Exception:
+            pass
+
+
+def run_job_search_sandbox(
+    user_prompt: str,
+    pool: Optional[SandboxPool] = None,
+    formatted_jobs: Optional[List[Dict[str, str]]] = None,
+):
+    """Run job search in Daytona sandbox with web preview
+
+    With a pool, results are uploaded to an already-running sandbox which is
+    returned to the pool afterwards; each search gets its own results URL,
+    valid for at least SANDBOX_RESULTS_TTL seconds.
+    Callers that already searched can pass `formatted_jobs` to skip the search.
+    """
+    
+    # Initialize Daytona
+    if not DAYTONA_API_KEY:
+        print("Error: DAYTONA_API_KEY environment variable not set")
+        return
+    
+    if formatted_jobs is None:
+        # Search for jobs
+        print(f"Searching jobs for: {user_prompt}")
+        jobs = get_searcher().search_jobs(user_prompt, num_pages=1)
+        print(f"Found {len(jobs)} jobs!")
+        formatted_jobs = [format_job_listing(job) for job in jobs[:10]]
+
+    if not formatted_jobs:
         print("No jobs found for your search.")
-        sandbox.delete()
         return None, None
 
+    if pool is not None:
+        entry = pool.acquire()
+        sandbox, base_url, ready = entry.sandbox, entry.url, entry.ready
+    else:
+        entry = None
+        sandbox, base_url, ready = start_results_app(get_daytona())
+
+    try:
+        # Upload results; the running app picks them up without a restart
+        result_id = uuid4().hex
+        sandbox.fs.upload_file(_dumps(formatted_jobs), f"results-{result_id}.json")
+    except Exception:
+        if entry is not None:
+            pool.discard(entry)
+        raise
+    if entry is not None:
+        pool.release(entry)
+
+    url = f"{base_url.rstrip('/')}/results/{result_id}"
+    print(f"\n✅ Job search app is running!")
+    print(f"Preview URL: {url}")
+    if not ready:
+        print("Note: App is starting up; if you see 502, wait a few seconds and refresh.")
+    
+    return sandbox, url
+
 
 def main():
     """Main entry point"""
@@ -0,0 +1,147 @@
+"""
+Job Search Results App
+Flask app uploaded into Daytona sandboxes as app.py; renders job results
+from JSON files written next to it, so new results need no restart
+"""
+
+import json
+from html import escape
+import os
+import re
+from typing import Dict, List
+
+from flask import Flask, abort
+
+app = Flask(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULT_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+# Fields shown on each job card, in render order
+CARD_FIELDS = ('title', 'company', 'location', 'employment_type', 'description', 'apply_link')
+
+# Page shell; job cards are substituted for __JOBS__
+PAGE_TEMPLATE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Job Search Results</title>
+        <style>
+            body {
+                font-family: Arial, sans-serif;
+                max-width: 1000px;
+                margin: 0 auto;
+                padding: 20px;
+                background-color: #f5f5f5;
+            }
+            h1 {
+                text-align: center;
+                color: #333;
+            }
+            .job-card {
+                background-color: white;
+                border: 1px solid #ddd;
+                border-radius: 8px;
+                padding: 20px;
+                margin: 15px 0;
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            }
+            .job-card h3 {
+                margin-top: 0;
+                color: #2c3e50;
+            }
+            .job-card p {
+                margin: 10px 0;
+                color: #555;
+            }
+            .job-card strong {
+                color: #333;
+            }
+            .btn {
+                display: inline-block;
+                padding: 10px 20px;
+                background-color: #007bff;
+                color: white;
+                text-decoration: none;
+                border-radius: 4px;
+                margin-top: 10px;
+                transition: background-color 0.3s;
+            }
+            .btn:hover {
+                background-color: #0056b3;
+            }
+        </style>
+    </head>
+    <body>
+        <h1>🔍 Job Search Results</h1>
+        __JOBS__
+    </body>
+    </html>
+    """
+
+
+def result_path(result_id: str) -> str:
+    """Path of the JSON file holding formatted jobs for a result id"""
+    return os.path.join(BASE_DIR, f'results-{result_id}.json')
+
+
+def render_jobs_page(formatted_jobs: List[Dict[str, str]]) -> str:
+    """Render formatted job listings as an HTML page"""
+    # Job fields come from the jsearch API, so escape everything interpolated.
+    # Escaping is done per field into parallel columns, then zipped back into rows.
+    titles, companies, locations, employment_types, descriptions, apply_links = (
+        [escape(str(job[field])) for job in formatted_jobs] for field in CARD_FIELDS
+    )
+    parts = []
+    for i, (title, company, location, employment_type, description, apply_link) in enumerate(
+        zip(titles, companies, locations, employment_types, descriptions, apply_links), 1
+    ):
+        parts.append(f"""
+        <div class="job-card">
+            <h3>{i}. {title}</h3>
+            <p><strong>Company:</strong> {company}</p>
+            <p><strong>Location:</strong> {location}</p>
+            <p><strong>Type:</strong> {employment_type}</p>
+            <p><strong>Description:</strong> {description}</p>
+            <a href="{apply_link}" target="_blank" class="btn">Apply Now</a>
+        </div>
+        """)
+    return PAGE_TEMPLATE.replace("__JOBS__", "".join(parts))
+
+
+def load_jobs(path: str) -> List[Dict[str, str]]:
+    """Read a results file written by the host"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@app.route('/callback')
+def callback():
+    return "ok", 200
+
+
+@app.route('/healthz')
+def healthz():
+    return "ok", 200
+
+
+@app.route('/')
+def index():
+    """Empty page; sandboxes are shared, so results are only served by id"""
+    return render_jobs_page([])
+
+
+@app.route('/results/<result_id>')
+def results(result_id: str):
+    """Show the results uploaded under a specific id"""
+    if not RESULT_ID_RE.match(result_id):
+        abort(404)
+    path = result_path(result_id)
+    if not os.path.exists(path):
+        abort(404)
+    return render_jobs_page(load_jobs(path))
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', '3000'))
+    app.run(host='0.0.0.0', port=port)